@@ -0,0 +1,31 @@
+"""
+Blob storage configuration for uploaded specification files
+"""
+
+from functools import lru_cache
+import os
+
+from services.blob_storage import BlobStore, FilesystemBlobBackend, S3BlobBackend
+
+SPEC_FILE_STORAGE_TYPE = os.getenv("SPEC_FILE_STORAGE_TYPE", "filesystem")
+SPEC_FILE_STORAGE_PATH = os.getenv("SPEC_FILE_STORAGE_PATH", "data/spec_files")
+SPEC_FILE_S3_BUCKET = os.getenv("SPEC_FILE_S3_BUCKET", "")
+SPEC_FILE_S3_PREFIX = os.getenv("SPEC_FILE_S3_PREFIX", "spec-files")
+SPEC_FILE_S3_ENDPOINT_URL = os.getenv("SPEC_FILE_S3_ENDPOINT_URL") or None
+SPEC_FILE_COMPRESSION = os.getenv("SPEC_FILE_COMPRESSION") or None
+
+
+@lru_cache(maxsize=None)
+def get_blob_store() -> BlobStore:
+    """Dependency for getting the configured blob store"""
+    if SPEC_FILE_STORAGE_TYPE == "s3":
+        backend = S3BlobBackend(
+            bucket=SPEC_FILE_S3_BUCKET,
+            prefix=SPEC_FILE_S3_PREFIX,
+            endpoint_url=SPEC_FILE_S3_ENDPOINT_URL
+        )
+    elif SPEC_FILE_STORAGE_TYPE == "filesystem":
+        backend = FilesystemBlobBackend(SPEC_FILE_STORAGE_PATH)
+    else:
+        raise ValueError(f"Unsupported SPEC_FILE_STORAGE_TYPE: {SPEC_FILE_STORAGE_TYPE}")
+    return BlobStore(backend, compression=SPEC_FILE_COMPRESSION)
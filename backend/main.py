@@ -1,13 +1,47 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-import pandas as pd
 import io
+import importlib
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any
 import json
 from datetime import datetime
 
-app = FastAPI(title="Trim Ordering Automation API")
+from routers.columbia_spec import router as columbia_router
+
+logger = logging.getLogger(__name__)
+
+# Heavy modules are imported on first use rather than at startup; these are
+# loaded in a background thread once the server is up so the first request
+# that needs them does not pay the import cost. Set PREWARM_IMPORTS=0 to skip.
+PREWARM_MODULES = [
+    "pandas",
+    "openpyxl",
+    "models.columbia_spec",
+    "services.columbia_spec_service",
+]
+
+
+def _prewarm_imports():
+    for name in PREWARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.warning("Pre-warm import of %s failed: %s", name, e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.getenv("PREWARM_IMPORTS", "1") != "0":
+        threading.Thread(target=_prewarm_imports, name="prewarm-imports", daemon=True).start()
+    yield
+
+
+app = FastAPI(title="Trim Ordering Automation API", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -18,6 +52,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(columbia_router)
+
 # In-memory storage (replace with database in production)
 workflows = {}
 
@@ -42,12 +78,16 @@ async def get_workflow(workflow_id: str):
         raise HTTPException(status_code=404, detail="Workflow not found")
     return workflows[workflow_id]
 
+# Plain def so the pandas import and parsing run in the threadpool, not on
+# the event loop
 @app.post("/api/upload/schedule")
-async def upload_schedule(file: UploadFile = File(...)):
+def upload_schedule(file: UploadFile = File(...)):
     """Upload and parse PO schedule file"""
     try:
+        import pandas as pd
+
         # Read file content
-        contents = await file.read()
+        contents = file.file.read()
         
         # Parse based on file type
         if file.filename.endswith('.csv'):
@@ -107,8 +147,9 @@ async def generate_pivot(request: Dict[str, Any]):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating pivot: {str(e)}")
 
+# Plain def for the same reason as upload_schedule
 @app.post("/api/export/excel")
-async def export_to_excel(request: Dict[str, Any]):
+def export_to_excel(request: Dict[str, Any]):
     """Export pivot data to Excel"""
     try:
         pivot_data = request.get('pivotData', [])
@@ -116,6 +157,8 @@ async def export_to_excel(request: Dict[str, Any]):
         if not pivot_data:
             raise HTTPException(status_code=400, detail="No pivot data to export")
         
+        import pandas as pd
+        
         # Create DataFrame
         df = pd.DataFrame(pivot_data)
         
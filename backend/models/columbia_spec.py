@@ -1,14 +1,21 @@
 """
 Database models for Columbia Sportswear specification data
 SQLAlchemy ORM models
+
+The per-specification child tables (trims, suppliers, color BOM,
+measurements, parsing logs) are range-partitioned by ``spec_id`` on
+PostgreSQL; see ``services/partitioning.py``. ``spec_id`` is therefore part
+of each child table's primary key.
 """
 
-from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, ForeignKey, Boolean, Index
+from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, ForeignKey, ForeignKeyConstraint, Boolean, Index
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime
 
 Base = declarative_base()
 
+PARTITION_BY_SPEC = {'postgresql_partition_by': 'RANGE (spec_id)'}
+
 
 class ColumbiaSpecification(Base):
     """
@@ -21,7 +28,7 @@ class ColumbiaSpecification(Base):
     original_filename = Column(String(255), nullable=False)
     file_type = Column(String(50))
     file_size = Column(Integer)
-    upload_date = Column(DateTime, default=datetime.utcnow)
+    upload_date = Column(DateTime, default=datetime.utcnow, nullable=False)  # Keyset pagination key
     parsed_date = Column(DateTime, default=datetime.utcnow)
     status = Column(String(50), default='parsed')
     error_message = Column(Text)
@@ -32,16 +39,16 @@ class ColumbiaSpecification(Base):
     created_by = Column(Integer)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationships
-    trims = relationship('ColumbiaTrim', back_populates='specification', cascade='all, delete-orphan')
-    color_bom = relationship('ColumbiaColorBOM', back_populates='specification', cascade='all, delete-orphan')
-    measurements = relationship('ColumbiaMeasurement', back_populates='specification', cascade='all, delete-orphan')
-    file_storage = relationship('ColumbiaSpecFile', back_populates='specification', uselist=False, cascade='all, delete-orphan')
+    # Relationships (children are removed by ON DELETE CASCADE, not loaded and deleted row by row)
+    trims = relationship('ColumbiaTrim', back_populates='specification', cascade='all, delete-orphan', passive_deletes=True)
+    color_bom = relationship('ColumbiaColorBOM', back_populates='specification', cascade='all, delete-orphan', passive_deletes=True)
+    measurements = relationship('ColumbiaMeasurement', back_populates='specification', cascade='all, delete-orphan', passive_deletes=True)
+    file_storage = relationship('ColumbiaSpecFile', back_populates='specification', uselist=False, cascade='all, delete-orphan', passive_deletes=True)
     exports = relationship('ColumbiaExport', back_populates='specification', cascade='all, delete-orphan')
-    logs = relationship('ColumbiaParsingLog', back_populates='specification', cascade='all, delete-orphan')
+    logs = relationship('ColumbiaParsingLog', back_populates='specification', cascade='all, delete-orphan', passive_deletes=True)
     
     __table_args__ = (
-        Index('idx_spec_upload_date', 'upload_date'),
+        Index('idx_spec_upload_date', 'upload_date', 'id'),
         Index('idx_spec_status', 'status'),
         Index('idx_spec_filename', 'filename'),
     )
@@ -57,7 +64,7 @@ class ColumbiaTrim(Base):
     __tablename__ = 'columbia_spec_trims'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    spec_id = Column(Integer, ForeignKey('columbia_specifications.id', ondelete='CASCADE'), nullable=False)
+    spec_id = Column(Integer, ForeignKey('columbia_specifications.id', ondelete='CASCADE'), primary_key=True)
     number = Column(String(50), nullable=False)
     description = Column(Text, nullable=False)
     um = Column(String(20))  # Unit of Measurement
@@ -72,12 +79,13 @@ class ColumbiaTrim(Base):
     
     # Relationships
     specification = relationship('ColumbiaSpecification', back_populates='trims')
-    suppliers = relationship('ColumbiaSupplier', back_populates='trim', cascade='all, delete-orphan')
+    suppliers = relationship('ColumbiaSupplier', back_populates='trim', cascade='all, delete-orphan', passive_deletes=True)
     
     __table_args__ = (
         Index('idx_trim_number', 'number'),
-        Index('idx_trim_spec', 'spec_id'),
+        Index('idx_trim_spec', 'spec_id', 'id'),
         Index('idx_trim_created', 'created_at'),
+        PARTITION_BY_SPEC,
     )
     
     def __repr__(self):
@@ -91,7 +99,8 @@ class ColumbiaSupplier(Base):
     __tablename__ = 'columbia_spec_suppliers'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    trim_id = Column(Integer, ForeignKey('columbia_spec_trims.id', ondelete='CASCADE'), nullable=False)
+    spec_id = Column(Integer, primary_key=True)  # Denormalized from the trim for partitioning
+    trim_id = Column(Integer, nullable=False)
     name = Column(String(255), nullable=False)
     art_no = Column(String(100))  # Supplier Art Number
     country = Column(String(100))  # Country of Origin
@@ -106,9 +115,16 @@ class ColumbiaSupplier(Base):
     trim = relationship('ColumbiaTrim', back_populates='suppliers')
     
     __table_args__ = (
-        Index('idx_supplier_trim', 'trim_id'),
+        ForeignKeyConstraint(
+            ['spec_id', 'trim_id'],
+            ['columbia_spec_trims.spec_id', 'columbia_spec_trims.id'],
+            ondelete='CASCADE'
+        ),
+        Index('idx_supplier_spec', 'spec_id', 'id'),
+        Index('idx_supplier_trim', 'trim_id', 'id'),
         Index('idx_supplier_name', 'name'),
         Index('idx_supplier_country', 'country'),
+        PARTITION_BY_SPEC,
     )
     
     def __repr__(self):
@@ -122,7 +138,7 @@ class ColumbiaColorBOM(Base):
     __tablename__ = 'columbia_spec_color_bom'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    spec_id = Column(Integer, ForeignKey('columbia_specifications.id', ondelete='CASCADE'), nullable=False)
+    spec_id = Column(Integer, ForeignKey('columbia_specifications.id', ondelete='CASCADE'), primary_key=True)
     color_name = Column(String(255), nullable=False)
     component_name = Column(String(255), nullable=False)
     usage_details = Column(Text)
@@ -135,8 +151,9 @@ class ColumbiaColorBOM(Base):
     specification = relationship('ColumbiaSpecification', back_populates='color_bom')
     
     __table_args__ = (
-        Index('idx_bom_spec', 'spec_id'),
+        Index('idx_bom_spec', 'spec_id', 'id'),
         Index('idx_bom_color', 'color_name'),
+        PARTITION_BY_SPEC,
     )
     
     def __repr__(self):
@@ -150,7 +167,7 @@ class ColumbiaMeasurement(Base):
     __tablename__ = 'columbia_spec_measurements'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    spec_id = Column(Integer, ForeignKey('columbia_specifications.id', ondelete='CASCADE'), nullable=False)
+    spec_id = Column(Integer, ForeignKey('columbia_specifications.id', ondelete='CASCADE'), primary_key=True)
     measurement_key = Column(String(255), nullable=False)
     measurement_value = Column(String(255))
     unit = Column(String(50))
@@ -163,6 +180,7 @@ class ColumbiaMeasurement(Base):
     __table_args__ = (
         Index('idx_measurements_spec', 'spec_id'),
         Index('idx_measurements_key', 'measurement_key'),
+        PARTITION_BY_SPEC,
     )
     
     def __repr__(self):
@@ -172,13 +190,20 @@ class ColumbiaMeasurement(Base):
 class ColumbiaSpecFile(Base):
     """
     File storage for specifications
+    
+    Holds only a reference to the original upload in the blob store;
+    the file bytes themselves never live in the database.
     """
     __tablename__ = 'columbia_spec_files'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     spec_id = Column(Integer, ForeignKey('columbia_specifications.id', ondelete='CASCADE'), nullable=False, unique=True)
-    file_path = Column(Text)  # Path to stored file
-    file_content = Column(Text)  # Base64 encoded content or file path
+    file_path = Column(Text)  # Blob store key of the stored file
+    content_hash = Column(String(64))  # SHA-256 of the original bytes
+    content_type = Column(String(100))
+    content_size = Column(Integer)  # Original size in bytes
+    stored_size = Column(Integer)  # Compressed size in bytes
+    compression = Column(String(20))  # 'zstd' or 'gzip'
     storage_type = Column(String(50), default='filesystem')
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -187,6 +212,7 @@ class ColumbiaSpecFile(Base):
     
     __table_args__ = (
         Index('idx_spec_file_spec', 'spec_id'),
+        Index('idx_spec_file_path', 'file_path'),
     )
     
     def __repr__(self):
@@ -205,7 +231,7 @@ class ColumbiaExport(Base):
     export_format = Column(String(50))
     filename = Column(String(255))
     file_path = Column(Text)
-    exported_at = Column(DateTime, default=datetime.utcnow)
+    exported_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # Keyset pagination key
     exported_by = Column(Integer)
     record_count = Column(Integer)
     
@@ -213,7 +239,7 @@ class ColumbiaExport(Base):
     specification = relationship('ColumbiaSpecification', back_populates='exports')
     
     __table_args__ = (
-        Index('idx_export_spec', 'spec_id'),
+        Index('idx_export_spec', 'spec_id', 'exported_at', 'id'),
         Index('idx_export_date', 'exported_at'),
     )
     
@@ -228,7 +254,7 @@ class ColumbiaParsingLog(Base):
     __tablename__ = 'columbia_spec_parsing_logs'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    spec_id = Column(Integer, ForeignKey('columbia_specifications.id', ondelete='CASCADE'))
+    spec_id = Column(Integer, ForeignKey('columbia_specifications.id', ondelete='CASCADE'), primary_key=True)
     log_level = Column(String(20))
     message = Column(Text)
     line_number = Column(Integer)
@@ -241,6 +267,7 @@ class ColumbiaParsingLog(Base):
     __table_args__ = (
         Index('idx_log_spec', 'spec_id'),
         Index('idx_log_level', 'log_level'),
+        PARTITION_BY_SPEC,
     )
     
     def __repr__(self):
@@ -0,0 +1,347 @@
+"""
+REST endpoints for Columbia specification data
+
+List endpoints use keyset pagination: pass the ``next_cursor`` from one
+response as ``cursor`` to get the next page. ``fields`` is a comma-separated
+column projection. Responses carry an ETag and honour ``If-None-Match``.
+
+Original spec files live in the blob store and are streamed on download,
+with single-range ``Range`` requests supported.
+
+The ORM models and service are imported inside the handlers so that
+importing this router (and starting the app) does not load SQLAlchemy.
+"""
+
+import hashlib
+import json
+import os
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+
+from config.database import get_db
+from config.storage import get_blob_store
+from services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page, resolve_fields, to_dict
+
+router = APIRouter(prefix="/api/columbia", tags=["columbia"])
+
+
+def _split_fields(fields: Optional[str]) -> Optional[List[str]]:
+    return [f for f in fields.split(',') if f.strip()] if fields else None
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether ``If-None-Match`` lists ``etag`` (weak comparison) or ``*``"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(',')}
+    return etag in candidates or "*" in candidates
+
+
+def _conditional_json(request: Request, payload: Dict[str, Any]) -> Response:
+    """Return ``payload`` as JSON with an ETag, or 304 if the client's copy is current"""
+    body = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _page_payload(page: Page, limit: int) -> Dict[str, Any]:
+    return {
+        "data": [to_dict(item, page.fields) for item in page.items],
+        "next_cursor": page.next_cursor,
+        "limit": limit,
+    }
+
+
+def _service(db, blob_store=None):
+    """Build the spec service, loading the ORM layer on first use"""
+    from services.columbia_spec_service import ColumbiaSpecService
+    return ColumbiaSpecService(db, blob_store)
+
+
+def _get_spec_or_404(service, spec_id: int):
+    spec = service.get_specification(spec_id)
+    if not spec:
+        raise HTTPException(status_code=404, detail="Specification not found")
+    return spec
+
+
+def _content_disposition(filename: str) -> str:
+    """
+    Build an ``attachment`` header that is safe for any filename (RFC 6266)
+
+    ``filename=`` carries an ASCII-only fallback; ``filename*=`` carries the
+    real name percent-encoded as UTF-8 (RFC 5987).
+    """
+    def ascii_safe(text: str) -> str:
+        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+        return ''.join(c if c.isprintable() and c not in '"\\' else '_' for c in text).strip()
+
+    stem, ext = os.path.splitext(filename)
+    fallback = (ascii_safe(stem) or 'download') + ascii_safe(ext)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def _parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into inclusive ``(start, end)`` offsets
+
+    Returns None for multi-range or non-byte requests, which are answered
+    with the full body. Raises 416 for unsatisfiable ranges.
+    """
+    unit, _, spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+
+    first, _, last = spec.strip().partition('-')
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end or start < 0:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, min(end, size - 1)
+
+
+@router.post("/upload")
+def upload_specification(
+    file: UploadFile = File(...),
+    db=Depends(get_db),
+    blob_store=Depends(get_blob_store)
+):
+    """Create a specification record and store its original file"""
+    service = _service(db, blob_store)
+    original_filename = file.filename or 'upload'
+
+    file.file.seek(0, os.SEEK_END)
+    file_size = file.file.tell()
+    file.file.seek(0)
+
+    spec = service.create_specification(
+        filename=original_filename,
+        original_filename=original_filename,
+        file_type=os.path.splitext(original_filename)[1].lstrip('.').lower() or None,
+        file_size=file_size
+    )
+    try:
+        spec_file = service.store_file(spec.id, file.file, file.content_type)
+    except Exception:
+        # Don't leave a spec behind that claims an upload but has no file
+        db.rollback()
+        service.delete_specification(spec.id)
+        raise
+    return {
+        "message": "Specification uploaded successfully",
+        "spec_id": spec.id,
+        "filename": original_filename,
+        "content_hash": spec_file.content_hash,
+        "stored_size": spec_file.stored_size
+    }
+
+
+@router.put("/specifications/{spec_id}/file")
+def replace_specification_file(
+    spec_id: int,
+    file: UploadFile = File(...),
+    db=Depends(get_db),
+    blob_store=Depends(get_blob_store)
+):
+    """Replace the original file stored for a specification"""
+    service = _service(db, blob_store)
+    _get_spec_or_404(service, spec_id)
+    spec_file = service.store_file(spec_id, file.file, file.content_type)
+    return {
+        "message": "File stored successfully",
+        "spec_id": spec_id,
+        "content_hash": spec_file.content_hash,
+        "stored_size": spec_file.stored_size
+    }
+
+
+@router.get("/specifications/{spec_id}/file")
+def download_specification_file(
+    spec_id: int,
+    request: Request,
+    db=Depends(get_db),
+    blob_store=Depends(get_blob_store)
+):
+    """Stream the original file of a specification, honouring ``Range``"""
+    service = _service(db, blob_store)
+    spec = _get_spec_or_404(service, spec_id)
+    spec_file = service.get_spec_file(spec_id)
+    if not spec_file or not spec_file.file_path:
+        raise HTTPException(status_code=404, detail="No file stored for this specification")
+
+    size = spec_file.content_size or 0
+    etag = f'"{spec_file.content_hash}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": _content_disposition(spec.original_filename),
+    }
+
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and size and (not if_range or if_range == etag):
+        byte_range = _parse_range(range_header, size)
+
+    media_type = spec_file.content_type or "application/octet-stream"
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        body = blob_store.iter_range(spec_file.file_path, spec_file.compression)
+        return StreamingResponse(body, media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    body = blob_store.iter_range(spec_file.file_path, spec_file.compression, start, end)
+    return StreamingResponse(body, status_code=206, media_type=media_type, headers=headers)
+
+
+@router.get("/specifications")
+def list_specifications(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    db=Depends(get_db)
+):
+    """List specifications, newest first"""
+    service = _service(db)
+    try:
+        page = service.list_specifications(limit, cursor, _split_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _conditional_json(request, _page_payload(page, limit))
+
+
+@router.get("/specifications/{spec_id}")
+def get_specification(
+    spec_id: int,
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    db=Depends(get_db)
+):
+    """Get specification metadata by ID"""
+    from models.columbia_spec import ColumbiaSpecification
+
+    service = _service(db)
+    try:
+        names = resolve_fields(ColumbiaSpecification, _split_fields(fields), required=['id'])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    spec = _get_spec_or_404(service, spec_id)
+    return _conditional_json(request, to_dict(spec, names))
+
+
+@router.get("/specifications/{spec_id}/trims")
+def list_specification_trims(
+    spec_id: int,
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    include_suppliers: bool = False,
+    supplier_fields: Optional[str] = Query(None, description="Comma-separated supplier columns"),
+    db=Depends(get_db)
+):
+    """List trims for a specification, optionally with their suppliers"""
+    service = _service(db)
+    _get_spec_or_404(service, spec_id)
+    try:
+        page = service.list_trims(spec_id, limit, cursor, _split_fields(fields))
+        payload = _page_payload(page, limit)
+        if include_suppliers:
+            from models.columbia_spec import ColumbiaSupplier
+
+            supplier_names = resolve_fields(
+                ColumbiaSupplier, _split_fields(supplier_fields), required=['id', 'spec_id', 'trim_id']
+            )
+            suppliers = service.get_suppliers_for_trims(
+                spec_id, [trim.id for trim in page.items], supplier_names
+            )
+            for row, trim in zip(payload["data"], page.items):
+                row["suppliers"] = [to_dict(s, supplier_names) for s in suppliers[trim.id]]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _conditional_json(request, payload)
+
+
+@router.get("/specifications/{spec_id}/suppliers")
+def list_specification_suppliers(
+    spec_id: int,
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    db=Depends(get_db)
+):
+    """List suppliers across all trims of a specification"""
+    service = _service(db)
+    _get_spec_or_404(service, spec_id)
+    try:
+        page = service.list_suppliers(spec_id, limit, cursor, _split_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _conditional_json(request, _page_payload(page, limit))
+
+
+@router.get("/specifications/{spec_id}/color-bom")
+def list_specification_color_bom(
+    spec_id: int,
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    db=Depends(get_db)
+):
+    """List color BOM rows for a specification"""
+    service = _service(db)
+    _get_spec_or_404(service, spec_id)
+    try:
+        page = service.list_color_bom(spec_id, limit, cursor, _split_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _conditional_json(request, _page_payload(page, limit))
+
+
+@router.get("/specifications/{spec_id}/exports")
+def list_specification_exports(
+    spec_id: int,
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    db=Depends(get_db)
+):
+    """List export history for a specification, newest first"""
+    service = _service(db)
+    _get_spec_or_404(service, spec_id)
+    try:
+        page = service.get_export_history(spec_id, limit, cursor, _split_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _conditional_json(request, _page_payload(page, limit))
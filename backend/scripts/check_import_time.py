@@ -0,0 +1,82 @@
+"""
+Import-time budget check for the backend app module
+
+Runs ``python -X importtime -c "import main"`` in fresh interpreters and
+fails if importing ``main`` pulls in a deferred heavy dependency or takes
+longer than the budget (median of several runs).
+
+Usage (from the backend directory):
+
+    python -m scripts.check_import_time [--budget-ms 800] [--runs 5]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = int(os.getenv("IMPORT_TIME_BUDGET_MS", "800"))
+
+# Modules that must only load on first use (or via the startup pre-warm)
+DEFERRED_MODULES = ["pandas", "openpyxl", "xlsxwriter", "sqlalchemy", "pyarrow", "boto3"]
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module: str = "main") -> tuple:
+    """Import ``module`` in a fresh interpreter; return (cumulative ms, imported module names)"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    cumulative_us = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        imported.add(name)
+        if name == module and not match.group(3).strip(' '):
+            cumulative_us = int(match.group(2))
+    if cumulative_us is None:
+        raise RuntimeError(f"No import timing found for {module}")
+    return cumulative_us / 1000, imported
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check the backend import-time budget")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=int, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    timings = []
+    imported = set()
+    for _ in range(args.runs):
+        elapsed_ms, names = measure(args.module)
+        timings.append(elapsed_ms)
+        imported |= names
+
+    median_ms = statistics.median(timings)
+    leaked = sorted(m for m in DEFERRED_MODULES if m in imported)
+
+    print(f"import {args.module}: median {median_ms:.0f} ms over {args.runs} runs (budget {args.budget_ms} ms)")
+    failed = False
+    if leaked:
+        print(f"FAIL: deferred modules imported at startup: {', '.join(leaked)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAIL: import time over budget by {median_ms - args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Measure cold start to first successful response
+
+Starts the server command, polls the health endpoint until it answers 200
+and reports the elapsed time. Fails if it exceeds the target.
+
+Usage (from the backend directory):
+
+    python -m scripts.measure_cold_start
+    python -m scripts.measure_cold_start --cmd "docker run --rm -p 8000:8000 trim-backend" --target-ms 5000
+"""
+
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+DEFAULT_TARGET_MS = int(os.getenv("COLD_START_TARGET_MS", "1500"))
+DEFAULT_PORT = 8765
+
+
+def wait_for(url: str, timeout_s: float, interval_s: float = 0.02) -> bool:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(interval_s)
+    return False
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold start to first response")
+    parser.add_argument("--cmd", help="Server command (default: uvicorn main:app on --port)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--url", help="URL to poll (default: http://127.0.0.1:<port>/api/health)")
+    parser.add_argument("--target-ms", type=int, default=DEFAULT_TARGET_MS)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Give up after this many seconds")
+    args = parser.parse_args(argv)
+
+    cmd = shlex.split(args.cmd) if args.cmd else [
+        sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(args.port)
+    ]
+    url = args.url or f"http://127.0.0.1:{args.port}/api/health"
+
+    started = time.monotonic()
+    process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        ready = wait_for(url, args.timeout)
+        elapsed_ms = (time.monotonic() - started) * 1000
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    if not ready:
+        print(f"FAIL: no response from {url} within {args.timeout:.0f} s")
+        return 1
+
+    print(f"Cold start to first response: {elapsed_ms:.0f} ms (target {args.target_ms} ms)")
+    if elapsed_ms > args.target_ms:
+        print(f"FAIL: over target by {elapsed_ms - args.target_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Partition maintenance for Columbia specification child tables
+
+Usage (from the backend directory):
+
+    python -m scripts.spec_partitions migrate
+    python -m scripts.spec_partitions list
+    python -m scripts.spec_partitions ensure
+    python -m scripts.spec_partitions archive --before 2025-07-01 --output archive/ [--dry-run]
+
+``migrate`` rebuilds child tables created before partitioning was introduced
+as partitioned tables; run it once, in a maintenance window.
+
+``archive`` writes every partition block whose specifications were all
+uploaded before the cutoff (typically the start of the oldest season to
+keep) to Parquet under ``--output``, then detaches and drops it.
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from config.database import get_session_factory
+from models.columbia_spec import ColumbiaSpecification
+from services.partitioning import (
+    archivable_ranges,
+    archive_range,
+    ensure_partitions,
+    is_postgresql,
+    list_partition_ranges,
+    migrate_to_partitions
+)
+
+
+def _format_block(block) -> str:
+    first = block.first_upload.date().isoformat() if block.first_upload else '-'
+    last = block.last_upload.date().isoformat() if block.last_upload else '-'
+    return f"specs {block.start}-{block.end - 1}: {block.spec_count} specs, uploaded {first} .. {last}"
+
+
+def cmd_list(db, args) -> int:
+    for block in list_partition_ranges(db):
+        print(_format_block(block))
+    return 0
+
+
+def cmd_ensure(db, args) -> int:
+    max_id = db.query(ColumbiaSpecification.id).order_by(ColumbiaSpecification.id.desc()).limit(1).scalar() or 0
+    ensure_partitions(db, max_id)
+    db.commit()
+    print(f"Partitions ready for spec ids up to {max_id}")
+    return 0
+
+
+def cmd_migrate(db, args) -> int:
+    result = migrate_to_partitions(db)
+    if not result.copied:
+        print("Child tables are already partitioned")
+        return 0
+    summary = ', '.join(f"{table}={count}" for table, count in result.copied.items())
+    print(f"Rebuilt as partitioned tables ({summary})")
+    if result.stale_views:
+        print(
+            f"Could not recreate views {', '.join(result.stale_views)}; "
+            f"reapply them from database/columbia_spec_schema.sql"
+        )
+    return 0
+
+
+def cmd_archive(db, args) -> int:
+    before = datetime.fromisoformat(args.before)
+    blocks = archivable_ranges(db, before)
+    if not blocks:
+        print(f"Nothing uploaded entirely before {args.before}")
+        return 0
+
+    for block in blocks:
+        if args.dry_run:
+            print(f"Would archive {_format_block(block)}")
+            continue
+        counts = archive_range(db, block, args.output)
+        summary = ', '.join(f"{table}={count}" for table, count in counts.items())
+        print(f"Archived {_format_block(block)} ({summary})")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('migrate', help='Rebuild unpartitioned child tables as partitioned tables')
+    subparsers.add_parser('list', help='List attached partition blocks')
+    subparsers.add_parser('ensure', help='Create partitions for the current and next spec id block')
+
+    archive = subparsers.add_parser('archive', help='Archive and drop old partition blocks')
+    archive.add_argument('--before', required=True, help='Upload date cutoff (YYYY-MM-DD)')
+    archive.add_argument('--output', default='archive', help='Directory for Parquet files')
+    archive.add_argument('--dry-run', action='store_true', help='Only report what would be archived')
+
+    args = parser.parse_args(argv)
+    commands = {'migrate': cmd_migrate, 'list': cmd_list, 'ensure': cmd_ensure, 'archive': cmd_archive}
+
+    db = get_session_factory()()
+    try:
+        if not is_postgresql(db):
+            print("Partition maintenance requires PostgreSQL", file=sys.stderr)
+            return 1
+        return commands[args.command](db, args)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
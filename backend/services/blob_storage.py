@@ -0,0 +1,244 @@
+"""
+Content-addressed, compressed blob storage for uploaded specification files
+
+Blobs are keyed by the SHA-256 of their original bytes and stored compressed
+(zstd when ``zstandard`` is installed, gzip otherwise). Only the resulting
+``BlobRef`` is kept in the database; file bytes are streamed to and from the
+backend in chunks and never held in memory whole.
+"""
+
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class BlobRef:
+    """Reference to a stored blob, as persisted on ColumbiaSpecFile"""
+    key: str
+    content_hash: str
+    compression: str
+    content_size: int
+    stored_size: int
+
+
+class FilesystemBlobBackend:
+    """Stores blobs as files under a local root directory"""
+
+    storage_type = 'filesystem'
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split('/'))
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def put(self, key: str, fileobj: BinaryIO):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                shutil.copyfileobj(fileobj, out, CHUNK_SIZE)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self._path(key), 'rb')
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3BlobBackend:
+    """Stores blobs in an S3 bucket or any S3-compatible service (MinIO, etc.)"""
+
+    storage_type = 's3'
+
+    def __init__(self, bucket: str, prefix: str = '', endpoint_url: Optional[str] = None, client=None):
+        if client is None:
+            try:
+                import boto3
+            except ImportError as e:
+                raise RuntimeError("S3 blob storage requires boto3 to be installed") from e
+            client = boto3.client('s3', endpoint_url=endpoint_url)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except self.client.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    def put(self, key: str, fileobj: BinaryIO):
+        self.client.upload_fileobj(fileobj, self.bucket, self._key(key))
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=self._key(key))['Body']
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+
+class BlobStore:
+    """Compresses, content-addresses and streams blobs through a backend"""
+
+    def __init__(self, backend, compression: Optional[str] = None, level: int = 6):
+        if compression is None:
+            compression = 'zstd' if zstandard is not None else 'gzip'
+        if compression == 'zstd' and zstandard is None:
+            raise RuntimeError("zstd compression requires the zstandard package")
+        if compression not in ('zstd', 'gzip'):
+            raise ValueError(f"Unsupported compression: {compression}")
+        self.backend = backend
+        self.compression = compression
+        self.level = level
+
+    @property
+    def storage_type(self) -> str:
+        return self.backend.storage_type
+
+    def put(self, fileobj: BinaryIO, lock: Optional[Callable[[str], None]] = None) -> BlobRef:
+        """
+        Store the contents of ``fileobj``
+
+        The stream is hashed and compressed in one pass into a spooled
+        temporary file, then handed to the backend under its content address.
+        Identical content is stored only once.
+
+        Args:
+            fileobj: Binary stream to store
+            lock: Called with the blob key before the existence check, so the
+                caller can serialize this write against a concurrent delete
+                of the same blob
+        """
+        digest = hashlib.sha256()
+        content_size = 0
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+            compressor = self._compressor(spool)
+            while True:
+                chunk = fileobj.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                content_size += len(chunk)
+                compressor.write(chunk)
+            compressor.close()
+
+            stored_size = spool.tell()
+            content_hash = digest.hexdigest()
+            key = self._key_for(content_hash)
+
+            if lock is not None:
+                lock(key)
+            if not self.backend.exists(key):
+                spool.seek(0)
+                self.backend.put(key, spool)
+
+        return BlobRef(
+            key=key,
+            content_hash=content_hash,
+            compression=self.compression,
+            content_size=content_size,
+            stored_size=stored_size
+        )
+
+    def iter_range(self, key: str, compression: str, start: int = 0,
+                   end: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Stream the original bytes ``[start, end]`` (inclusive) of a blob
+
+        Compressed streams cannot be seeked, so bytes before ``start`` are
+        decompressed and discarded; memory use stays bounded by the chunk size.
+        """
+        remaining = None if end is None else end - start + 1
+        to_skip = start
+
+        source = self.backend.open(key)
+        try:
+            for chunk in self._decompress(source, compression):
+                if to_skip:
+                    if len(chunk) <= to_skip:
+                        to_skip -= len(chunk)
+                        continue
+                    chunk = chunk[to_skip:]
+                    to_skip = 0
+                if remaining is not None:
+                    chunk = chunk[:remaining]
+                    remaining -= len(chunk)
+                if chunk:
+                    yield chunk
+                if remaining == 0:
+                    break
+        finally:
+            source.close()
+
+    def delete(self, key: str):
+        self.backend.delete(key)
+
+    def _key_for(self, content_hash: str) -> str:
+        suffix = 'zst' if self.compression == 'zstd' else 'gz'
+        return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}.{suffix}"
+
+    def _compressor(self, out: BinaryIO):
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor(level=self.level).stream_writer(out, closefd=False)
+        return gzip.GzipFile(fileobj=out, mode='wb', compresslevel=self.level, mtime=0)
+
+    def _decompress(self, source: BinaryIO, compression: str) -> Iterator[bytes]:
+        if compression == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("Reading zstd blobs requires the zstandard package")
+            yield from zstandard.ZstdDecompressor().read_to_iter(source, read_size=CHUNK_SIZE)
+            return
+        if compression != 'gzip':
+            raise ValueError(f"Unsupported compression: {compression}")
+
+        decompressor = zlib.decompressobj(wbits=31)
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            data = decompressor.decompress(chunk, CHUNK_SIZE)
+            if data:
+                yield data
+            while decompressor.unconsumed_tail:
+                data = decompressor.decompress(decompressor.unconsumed_tail, CHUNK_SIZE)
+                if data:
+                    yield data
+        tail = decompressor.flush()
+        if tail:
+            yield tail
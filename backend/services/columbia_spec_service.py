@@ -2,9 +2,10 @@
 Service layer for Columbia specification data operations
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy import text, tuple_
+from sqlalchemy.orm import Session, load_only
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, BinaryIO
 import traceback
 
 from models.columbia_spec import (
@@ -17,13 +18,17 @@ from models.columbia_spec import (
     ColumbiaExport,
     ColumbiaParsingLog
 )
+from services.blob_storage import BlobStore
+from services.partitioning import ensure_partitions
+from services.pagination import Page, clamp_limit, decode_cursor, encode_cursor, resolve_fields
 
 
 class ColumbiaSpecService:
     """Service for managing Columbia specifications"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, blob_store: Optional[BlobStore] = None):
         self.db = db
+        self.blob_store = blob_store
     
     # ==================== CRUD Operations ====================
     
@@ -41,7 +46,14 @@ class ColumbiaSpecService:
             created_by=created_by
         )
         self.db.add(spec)
-        self.db.commit()
+        try:
+            self.db.flush()
+            # Same transaction as the insert, so a partition failure leaves no spec behind
+            ensure_partitions(self.db, spec.id)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         self.db.refresh(spec)
         return spec
     
@@ -51,25 +63,105 @@ class ColumbiaSpecService:
             ColumbiaSpecification.id == spec_id
         ).first()
     
-    def list_specifications(self, limit: int = 100, offset: int = 0) -> List[ColumbiaSpecification]:
-        """List all specifications"""
-        return self.db.query(ColumbiaSpecification).order_by(
-            ColumbiaSpecification.upload_date.desc()
-        ).limit(limit).offset(offset).all()
+    def list_specifications(self, limit: int = 100, cursor: Optional[str] = None,
+                            fields: Optional[Iterable[str]] = None) -> Page:
+        """List specifications, newest first, one keyset page at a time"""
+        return self._paginate(
+            self.db.query(ColumbiaSpecification),
+            ColumbiaSpecification,
+            keys=[ColumbiaSpecification.upload_date, ColumbiaSpecification.id],
+            limit=limit, cursor=cursor, fields=fields, descending=True
+        )
     
     def delete_specification(self, spec_id: int) -> bool:
         """Delete a specification and all related data"""
         try:
             spec = self.get_specification(spec_id)
             if spec:
+                spec_file = spec.file_storage
+                blob_key = spec_file.file_path if spec_file else None
                 self.db.delete(spec)
                 self.db.commit()
+                if blob_key:
+                    self._release_blob(blob_key)
                 return True
             return False
         except Exception as e:
             self.db.rollback()
             raise
     
+    # ==================== File Storage ====================
+    
+    def store_file(self, spec_id: int, fileobj: BinaryIO,
+                   content_type: Optional[str] = None) -> ColumbiaSpecFile:
+        """
+        Stream an uploaded file into the blob store and record its reference
+        
+        Replaces any file already attached to the specification.
+        """
+        if self.blob_store is None:
+            raise RuntimeError("ColumbiaSpecService was created without a blob store")
+        
+        # The blob lock is held until the reference row commits below
+        ref = self.blob_store.put(fileobj, lock=self._lock_blob)
+        
+        try:
+            spec_file = self.get_spec_file(spec_id)
+            previous_key = spec_file.file_path if spec_file else None
+            if spec_file is None:
+                spec_file = ColumbiaSpecFile(spec_id=spec_id)
+                self.db.add(spec_file)
+            
+            spec_file.file_path = ref.key
+            spec_file.content_hash = ref.content_hash
+            spec_file.content_type = content_type
+            spec_file.content_size = ref.content_size
+            spec_file.stored_size = ref.stored_size
+            spec_file.compression = ref.compression
+            spec_file.storage_type = self.blob_store.storage_type
+            self.db.commit()
+        except Exception:
+            # Nothing references the blob just written; drop it unless
+            # another specification already shares it
+            self.db.rollback()
+            self._release_blob(ref.key)
+            raise
+        self.db.refresh(spec_file)
+        
+        if previous_key and previous_key != ref.key:
+            self._release_blob(previous_key)
+        return spec_file
+    
+    def get_spec_file(self, spec_id: int) -> Optional[ColumbiaSpecFile]:
+        """Get the stored file reference for a specification"""
+        return self.db.query(ColumbiaSpecFile).filter(
+            ColumbiaSpecFile.spec_id == spec_id
+        ).first()
+    
+    def _lock_blob(self, key: str):
+        """
+        Serialize writers and deleters of one blob until the transaction ends
+        
+        Without this, an upload could see the blob exist and skip writing it,
+        while a concurrent release sees no referencing row and deletes it.
+        """
+        if self.db.get_bind().dialect.name == 'postgresql':
+            self.db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": key})
+    
+    def _release_blob(self, key: str):
+        """Delete a blob once no specification references it any more"""
+        if self.blob_store is None:
+            return
+        try:
+            self._lock_blob(key)
+            still_used = self.db.query(ColumbiaSpecFile.id).filter(
+                ColumbiaSpecFile.file_path == key
+            ).first()
+            if not still_used:
+                self.blob_store.delete(key)
+        finally:
+            self.db.commit()
+    
     # ==================== Parser Integration ====================
     
     def save_parsed_data(self, spec_id: int, parsed_data: Dict[str, Any]) -> bool:
@@ -141,6 +233,7 @@ class ColumbiaSpecService:
             if 'suppliers' in trim_data:
                 for supplier_data in trim_data['suppliers']:
                     supplier = ColumbiaSupplier(
+                        spec_id=spec_id,
                         trim_id=trim.id,
                         name=supplier_data.get('name', ''),
                         art_no=supplier_data.get('artNo', ''),
@@ -194,9 +287,9 @@ class ColumbiaSpecService:
                 ColumbiaTrim.spec_id == spec_id
             ).count()
             
-            spec.total_suppliers = self.db.query(ColumbiaSupplier).join(
-                ColumbiaTrim
-            ).filter(ColumbiaTrim.spec_id == spec_id).count()
+            spec.total_suppliers = self.db.query(ColumbiaSupplier).filter(
+                ColumbiaSupplier.spec_id == spec_id
+            ).count()
             
             spec.total_colors = self.db.query(ColumbiaColorBOM.color_name).filter(
                 ColumbiaColorBOM.spec_id == spec_id
@@ -210,24 +303,70 @@ class ColumbiaSpecService:
     
     # ==================== Query Methods ====================
     
-    def get_trims_with_suppliers(self, spec_id: int) -> List[Dict[str, Any]]:
-        """Get all trims with their suppliers for a specification"""
-        trims = self.db.query(ColumbiaTrim).filter(
-            ColumbiaTrim.spec_id == spec_id
-        ).all()
+    def get_trims_with_suppliers(self, spec_id: int, limit: int = 100,
+                                 cursor: Optional[str] = None) -> Page:
+        """
+        Get one keyset page of trims with their suppliers for a specification
         
-        results = []
-        for trim in trims:
-            suppliers = self.db.query(ColumbiaSupplier).filter(
-                ColumbiaSupplier.trim_id == trim.id
-            ).all()
-            
-            results.append({
-                'trim': trim,
-                'suppliers': suppliers
-            })
+        Items are ``{'trim': ..., 'suppliers': [...]}``; the suppliers for the
+        whole page are loaded in a single query.
+        """
+        page = self.list_trims(spec_id, limit, cursor)
+        suppliers = self.get_suppliers_for_trims(spec_id, [trim.id for trim in page.items])
+        return Page(
+            items=[{'trim': trim, 'suppliers': suppliers[trim.id]} for trim in page.items],
+            next_cursor=page.next_cursor,
+            fields=page.fields
+        )
+    
+    def list_trims(self, spec_id: int, limit: int = 100, cursor: Optional[str] = None,
+                   fields: Optional[Iterable[str]] = None) -> Page:
+        """List trims for a specification in id order, one keyset page at a time"""
+        return self._paginate(
+            self.db.query(ColumbiaTrim).filter(ColumbiaTrim.spec_id == spec_id),
+            ColumbiaTrim,
+            keys=[ColumbiaTrim.id],
+            limit=limit, cursor=cursor, fields=fields
+        )
+    
+    def get_suppliers_for_trims(self, spec_id: int, trim_ids: List[int],
+                                fields: Optional[Iterable[str]] = None) -> Dict[int, List[ColumbiaSupplier]]:
+        """Batch-load suppliers for a page of trims, keyed by trim id"""
+        grouped = {trim_id: [] for trim_id in trim_ids}
+        if not trim_ids:
+            return grouped
+        
+        names = resolve_fields(ColumbiaSupplier, fields, required=['id', 'spec_id', 'trim_id'])
+        suppliers = self.db.query(ColumbiaSupplier).options(
+            load_only(*[getattr(ColumbiaSupplier, n) for n in names])
+        ).filter(
+            ColumbiaSupplier.spec_id == spec_id,
+            ColumbiaSupplier.trim_id.in_(trim_ids)
+        ).order_by(ColumbiaSupplier.trim_id, ColumbiaSupplier.id).all()
         
-        return results
+        for supplier in suppliers:
+            grouped[supplier.trim_id].append(supplier)
+        return grouped
+    
+    def list_suppliers(self, spec_id: int, limit: int = 100, cursor: Optional[str] = None,
+                       fields: Optional[Iterable[str]] = None) -> Page:
+        """List all suppliers across a specification's trims, one keyset page at a time"""
+        return self._paginate(
+            self.db.query(ColumbiaSupplier).filter(ColumbiaSupplier.spec_id == spec_id),
+            ColumbiaSupplier,
+            keys=[ColumbiaSupplier.id],
+            limit=limit, cursor=cursor, fields=fields
+        )
+    
+    def list_color_bom(self, spec_id: int, limit: int = 100, cursor: Optional[str] = None,
+                       fields: Optional[Iterable[str]] = None) -> Page:
+        """List color BOM rows for a specification, one keyset page at a time"""
+        return self._paginate(
+            self.db.query(ColumbiaColorBOM).filter(ColumbiaColorBOM.spec_id == spec_id),
+            ColumbiaColorBOM,
+            keys=[ColumbiaColorBOM.id],
+            limit=limit, cursor=cursor, fields=fields
+        )
     
     def search_trims(self, search_term: str, spec_id: Optional[int] = None) -> List[ColumbiaTrim]:
         """Search for trims by number or description"""
@@ -243,6 +382,40 @@ class ColumbiaSpecService:
     
     # ==================== Helper Methods ====================
     
+    def _paginate(self, query, model, keys: List[Any], limit: int, cursor: Optional[str],
+                  fields: Optional[Iterable[str]], descending: bool = False) -> Page:
+        """
+        Fetch one keyset page from ``query``
+        
+        Rows are ordered by ``keys`` and the cursor carries the key values of
+        the last row returned, so the next page is a range scan on the
+        matching index rather than an OFFSET that re-reads skipped rows.
+        Key columns must be NOT NULL; a NULL key would drop out of the
+        range predicate and could not be encoded in a cursor.
+        
+        Raises:
+            ValueError: On an invalid cursor or unknown field
+        """
+        limit = clamp_limit(limit)
+        names = resolve_fields(model, fields, required=[k.key for k in keys])
+        query = query.options(load_only(*[getattr(model, n) for n in names]))
+        
+        if cursor:
+            after = decode_cursor(cursor, [k.type.python_type for k in keys])
+            row_key = tuple_(*keys) if len(keys) > 1 else keys[0]
+            cursor_key = tuple_(*after) if len(keys) > 1 else after[0]
+            query = query.filter(row_key < cursor_key if descending else row_key > cursor_key)
+        
+        order = [k.desc() if descending else k.asc() for k in keys]
+        rows = query.order_by(*order).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([getattr(rows[-1], k.key) for k in keys])
+        
+        return Page(items=rows, next_cursor=next_cursor, fields=names)
+    
     def _safe_decimal(self, value: Any) -> Optional[float]:
         """Safely convert to decimal"""
         if value is None or value == '':
@@ -294,9 +467,13 @@ class ColumbiaSpecService:
         self.db.commit()
         return export
     
-    def get_export_history(self, spec_id: int) -> List[ColumbiaExport]:
-        """Get export history for a specification"""
-        return self.db.query(ColumbiaExport).filter(
-            ColumbiaExport.spec_id == spec_id
-        ).order_by(ColumbiaExport.exported_at.desc()).all()
+    def get_export_history(self, spec_id: int, limit: int = 100, cursor: Optional[str] = None,
+                           fields: Optional[Iterable[str]] = None) -> Page:
+        """Get export history for a specification, newest first, one keyset page at a time"""
+        return self._paginate(
+            self.db.query(ColumbiaExport).filter(ColumbiaExport.spec_id == spec_id),
+            ColumbiaExport,
+            keys=[ColumbiaExport.exported_at, ColumbiaExport.id],
+            limit=limit, cursor=cursor, fields=fields, descending=True
+        )
 
@@ -0,0 +1,116 @@
+"""
+Keyset (cursor) pagination and field projection helpers
+
+Cursors are opaque, URL-safe tokens holding the sort-key values of the last
+row on a page. The next page is fetched with a ``WHERE (key) < (cursor)``
+predicate on an indexed column tuple, so every page costs the same as the
+first one regardless of how deep the client has paged.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+@dataclass
+class Page:
+    """A single page of results plus the cursor for the next one"""
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    fields: List[str] = field(default_factory=list)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row into an opaque cursor"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> tuple:
+    """
+    Decode a cursor produced by ``encode_cursor``
+
+    Args:
+        cursor: Opaque cursor string from a previous page
+        types: Expected Python type of each key column (``datetime`` or ``int``)
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match ``types``
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+    decoded = []
+    for value, expected in zip(values, types):
+        try:
+            if expected is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            else:
+                decoded.append(expected(value))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    return tuple(decoded)
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    """Bound a requested page size to ``[1, MAX_PAGE_SIZE]``"""
+    if not limit:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def resolve_fields(model, fields: Optional[Iterable[str]], required: Iterable[str] = ()) -> List[str]:
+    """
+    Validate a field projection against a model's columns
+
+    Args:
+        model: SQLAlchemy mapped class
+        fields: Requested column names, or None for all columns
+        required: Columns that are always loaded (primary and sort keys)
+
+    Returns:
+        List of column names in model order
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    from sqlalchemy import inspect
+
+    columns = [c.key for c in inspect(model).column_attrs]
+    if not fields:
+        return columns
+
+    requested = {f.strip() for f in fields if f and f.strip()}
+    unknown = requested - set(columns)
+    if unknown:
+        raise ValueError(f"Unknown field(s) for {model.__tablename__}: {', '.join(sorted(unknown))}")
+
+    requested.update(required)
+    return [c for c in columns if c in requested]
+
+
+def to_dict(obj: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    """Serialize the given columns of an ORM object to JSON-friendly values"""
+    result = {}
+    for name in fields:
+        value = getattr(obj, name)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif value is not None and not isinstance(value, (str, int, float, bool)):
+            value = float(value) if hasattr(value, 'as_tuple') else str(value)
+        result[name] = value
+    return result
@@ -0,0 +1,456 @@
+"""
+PostgreSQL partition management and archival for specification child tables
+
+Child rows are range-partitioned by ``spec_id`` in fixed-width blocks of
+``SPEC_PARTITION_SIZE`` specifications. Because spec ids are allocated in
+upload order, each partition holds a contiguous slice of upload history, so
+old seasons can be archived by detaching whole partitions, writing them to
+Parquet and dropping them, instead of cascading row-by-row deletes.
+
+``SPEC_PARTITION_SIZE`` must stay the same for the lifetime of a database;
+changing it makes new blocks overlap existing partitions.
+
+All functions are no-ops (or refuse to run) on databases other than
+PostgreSQL.
+"""
+
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from models.columbia_spec import (
+    ColumbiaSpecification,
+    ColumbiaTrim,
+    ColumbiaSupplier,
+    ColumbiaColorBOM,
+    ColumbiaMeasurement,
+    ColumbiaSpecFile,
+    ColumbiaParsingLog
+)
+
+
+SPEC_PARTITION_SIZE = int(os.getenv("SPEC_PARTITION_SIZE", "1000"))
+ARCHIVE_BATCH_SIZE = 10000
+ARCHIVE_LOCK_TIMEOUT = os.getenv("ARCHIVE_LOCK_TIMEOUT", "5s")
+
+# Referencing tables come before the tables they reference, which is the
+# order partitions must be detached and dropped in.
+PARTITIONED_MODELS = [
+    ColumbiaSupplier,
+    ColumbiaTrim,
+    ColumbiaColorBOM,
+    ColumbiaMeasurement,
+    ColumbiaParsingLog,
+]
+
+_known_blocks: Set[int] = set()
+_partitioning_verified = False
+_PENDING_BLOCKS = 'pending_partition_blocks'
+_LEGACY_SUFFIX = '_unpartitioned'
+
+
+@dataclass
+class PartitionRange:
+    """One block of spec ids shared by a partition of every child table"""
+    start: int
+    end: int  # Exclusive
+    spec_count: int = 0
+    first_upload: Optional[datetime] = None
+    last_upload: Optional[datetime] = None
+
+    @property
+    def suffix(self) -> str:
+        return f"p{self.start}_{self.end}"
+
+
+@dataclass
+class MigrationResult:
+    """Outcome of rebuilding unpartitioned child tables"""
+    copied: Dict[str, int] = field(default_factory=dict)  # Rows per rebuilt table
+    stale_views: List[str] = field(default_factory=list)  # Views to reapply by hand
+
+
+def is_postgresql(db: Session) -> bool:
+    return db.get_bind().dialect.name == 'postgresql'
+
+
+def partition_range_for(spec_id: int) -> PartitionRange:
+    """Return the partition block that contains ``spec_id``"""
+    start = (spec_id // SPEC_PARTITION_SIZE) * SPEC_PARTITION_SIZE
+    return PartitionRange(start=start, end=start + SPEC_PARTITION_SIZE)
+
+
+def partition_name(table: str, block: PartitionRange) -> str:
+    return f"{table}_{block.suffix}"
+
+
+def ensure_partitions(db: Session, spec_id: int):
+    """
+    Make sure every child table has a partition for ``spec_id``
+
+    The following block is created as well, so inserts never race against
+    partition creation at a block boundary. The DDL runs in the caller's
+    transaction, so it commits or rolls back together with the rows that
+    need it; created blocks are cached per process once that commit succeeds.
+
+    Raises:
+        RuntimeError: If the child tables are not partitioned yet
+    """
+    if not is_postgresql(db):
+        return
+
+    current = partition_range_for(spec_id)
+    upcoming = partition_range_for(current.end)
+    blocks = [block for block in (current, upcoming) if block.start not in _known_blocks]
+    if not blocks:
+        return
+
+    _require_partitioned(db)
+    for block in blocks:
+        _create_block(db, block)
+
+
+def _create_block(db: Session, block: PartitionRange):
+    for model in reversed(PARTITIONED_MODELS):
+        table = model.__tablename__
+        name = partition_name(table, block)
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": name})
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ({block.start}) TO ({block.end})"
+        ))
+    db.info.setdefault(_PENDING_BLOCKS, set()).add(block.start)
+
+
+@event.listens_for(Session, 'after_commit')
+def _cache_committed_blocks(session: Session):
+    _known_blocks.update(session.info.pop(_PENDING_BLOCKS, ()))
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _forget_uncommitted_blocks(session: Session, transaction):
+    # Runs after after_commit, so anything still pending was rolled back
+    if transaction.parent is None:
+        session.info.pop(_PENDING_BLOCKS, None)
+
+
+def _partitioned_tables(db: Session) -> Set[str]:
+    return set(db.execute(text(
+        "SELECT c.relname FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = ANY(:names)"
+    ), {"names": [model.__tablename__ for model in PARTITIONED_MODELS]}).scalars())
+
+
+def _require_partitioned(db: Session):
+    global _partitioning_verified
+    if _partitioning_verified:
+        return
+    missing = [
+        model.__tablename__ for model in PARTITIONED_MODELS
+        if model.__tablename__ not in _partitioned_tables(db)
+    ]
+    if missing:
+        raise RuntimeError(
+            f"Child tables are not partitioned ({', '.join(missing)}); "
+            f"run 'python -m scripts.spec_partitions migrate' from the backend directory"
+        )
+    _partitioning_verified = True
+
+
+def migrate_to_partitions(db: Session) -> MigrationResult:
+    """
+    Rebuild child tables created before partitioning as partitioned tables
+
+    Each unpartitioned table is renamed aside, recreated from the model,
+    given partitions for every block that has specifications, refilled and
+    dropped. Views and triggers on the old tables are recreated on the new
+    ones; views whose old definition no longer compiles are left dropped and
+    reported so they can be reapplied from the schema file. Parsing logs without a ``spec_id`` cannot be placed in a partition
+    and are not copied.
+
+    Everything runs in one transaction holding exclusive locks on the child
+    tables, so run it in a maintenance window.
+
+    Returns:
+        Rows copied per rebuilt table (none if everything is partitioned)
+        and the views that could not be recreated
+
+    Raises:
+        RuntimeError: If the database is not PostgreSQL
+    """
+    if not is_postgresql(db):
+        raise RuntimeError("Partition migration requires PostgreSQL")
+
+    partitioned = _partitioned_tables(db)
+    models = [model for model in PARTITIONED_MODELS if model.__tablename__ not in partitioned]
+    if not models:
+        return MigrationResult()
+    tables = [model.__tablename__ for model in models]
+    old = {table: f"{table}{_LEGACY_SUFFIX}" for table in tables}
+
+    result = MigrationResult()
+    try:
+        # Dependent views and triggers are captured while they still refer
+        # to the original table names, then recreated on the new tables
+        views = db.execute(text(
+            "SELECT DISTINCT v.oid::regclass::text, pg_get_viewdef(v.oid) "
+            "FROM pg_depend d "
+            "JOIN pg_rewrite r ON r.oid = d.objid "
+            "JOIN pg_class v ON v.oid = r.ev_class "
+            "WHERE d.refobjid = ANY(CAST(:tables AS regclass[])) "
+            "AND v.relkind = 'v' AND v.oid <> d.refobjid"
+        ), {"tables": tables}).all()
+        triggers = db.execute(text(
+            "SELECT pg_get_triggerdef(oid) FROM pg_trigger "
+            "WHERE tgrelid = ANY(CAST(:tables AS regclass[])) AND NOT tgisinternal"
+        ), {"tables": tables}).scalars().all()
+        for name, _ in views:
+            db.execute(text(f"DROP VIEW {name}"))
+
+        for table in tables:
+            sequence = db.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}).scalar()
+            indexes = db.execute(text(
+                "SELECT indexrelid::regclass::text FROM pg_index WHERE indrelid = CAST(:table AS regclass)"
+            ), {"table": table}).scalars().all()
+            db.execute(text(f"ALTER TABLE {table} RENAME TO {old[table]}"))
+            for index in indexes:
+                db.execute(text(f"ALTER INDEX {index} RENAME TO {index.split('.')[-1]}{_LEGACY_SUFFIX}"))
+            if sequence:
+                db.execute(text(f"ALTER SEQUENCE {sequence} RENAME TO {sequence.split('.')[-1]}{_LEGACY_SUFFIX}"))
+
+        for model in reversed(models):
+            model.__table__.create(bind=db.connection())
+
+        for start in db.execute(text(
+            "SELECT DISTINCT (id / :size) * :size FROM columbia_specifications ORDER BY 1"
+        ), {"size": SPEC_PARTITION_SIZE}).scalars():
+            _create_block(db, partition_range_for(start))
+        max_id = db.query(ColumbiaSpecification.id).order_by(ColumbiaSpecification.id.desc()).limit(1).scalar() or 0
+        current = partition_range_for(max_id)
+        for block in (current, partition_range_for(current.end)):
+            _create_block(db, block)
+
+        for model in reversed(models):
+            table = model.__tablename__
+            result.copied[table] = _copy_legacy_rows(db, model, old[table])
+            sequence = db.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}).scalar()
+            db.execute(text(
+                f"SELECT setval(CAST(:sequence AS regclass), GREATEST(MAX(id), 1)) FROM {table}"
+            ), {"sequence": sequence})
+
+        for table in tables:
+            db.execute(text(f"DROP TABLE {old[table]}"))
+        for name, definition in views:
+            try:
+                with db.begin_nested():
+                    db.execute(text(f"CREATE VIEW {name} AS {definition}"))
+            except DBAPIError:
+                # e.g. GROUP BY id no longer determines the row once spec_id
+                # joins the primary key; the caller reapplies these
+                result.stale_views.append(name)
+        for definition in triggers:
+            db.execute(text(definition))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result
+
+
+def _copy_legacy_rows(db: Session, model, source: str) -> int:
+    """Copy rows from a renamed unpartitioned table into its partitioned replacement"""
+    table = model.__tablename__
+    source_columns = set(db.execute(text(
+        "SELECT attname FROM pg_attribute "
+        "WHERE attrelid = CAST(:source AS regclass) AND attnum > 0 AND NOT attisdropped"
+    ), {"source": source}).scalars())
+    columns = [c.name for c in model.__table__.columns if c.name in source_columns]
+    column_list = ', '.join(columns)
+
+    if model is ColumbiaSupplier and 'spec_id' not in source_columns:
+        # Suppliers only gained spec_id with partitioning; take it from the trim
+        query = (
+            f"INSERT INTO {table} ({column_list}, spec_id) "
+            f"SELECT {', '.join('s.' + c for c in columns)}, t.spec_id FROM {source} s "
+            f"JOIN {ColumbiaTrim.__tablename__} t ON t.id = s.trim_id"
+        )
+    else:
+        query = f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {source} WHERE spec_id IS NOT NULL"
+    return db.execute(text(query)).rowcount
+
+
+def list_partition_ranges(db: Session) -> List[PartitionRange]:
+    """List the spec id blocks that currently have attached trim partitions"""
+    rows = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    ), {"parent": ColumbiaTrim.__tablename__}).scalars().all()
+
+    stats = {
+        start: (count, first, last)
+        for start, count, first, last in db.execute(text(
+            "SELECT (id / :size) * :size, COUNT(*), MIN(upload_date), MAX(upload_date) "
+            "FROM columbia_specifications GROUP BY 1"
+        ), {"size": SPEC_PARTITION_SIZE})
+    }
+
+    prefix = f"{ColumbiaTrim.__tablename__}_p"
+    blocks = []
+    for name in rows:
+        if not name.startswith(prefix):
+            continue
+        start, _, end = name[len(prefix):].partition('_')
+        block = PartitionRange(start=int(start), end=int(end))
+        block.spec_count, block.first_upload, block.last_upload = stats.get(block.start, (0, None, None))
+        blocks.append(block)
+    return sorted(blocks, key=lambda b: b.start)
+
+
+def archivable_ranges(db: Session, before: datetime) -> List[PartitionRange]:
+    """
+    Blocks whose specifications were all uploaded before ``before``
+
+    A block only qualifies once spec ids have moved past it, so a block that
+    can still receive new specifications is never archived.
+    """
+    max_id = db.query(ColumbiaSpecification.id).order_by(ColumbiaSpecification.id.desc()).limit(1).scalar() or 0
+    return [
+        block for block in list_partition_ranges(db)
+        if block.end <= max_id and (block.last_upload is None or block.last_upload < before)
+    ]
+
+
+def archive_range(db: Session, block: PartitionRange, output_dir: str) -> Dict[str, int]:
+    """
+    Write one block's partitions and their specs to Parquet, then drop them
+
+    The Parquet files are written first from a REPEATABLE READ snapshot while
+    the partitions are still attached, so readers and writers of other specs
+    are not blocked during the export. A short second transaction then
+    detaches and drops the partitions and deletes the spec rows, after
+    checking that the row counts still match what was written. Files are
+    written to temporary names and only moved into place after that commit.
+
+    Returns:
+        Row counts written per table
+
+    Raises:
+        RuntimeError: If the database is not PostgreSQL, or rows were added
+            or removed in the block while it was being written (retry the run)
+    """
+    if not is_postgresql(db):
+        raise RuntimeError("Partition archival requires PostgreSQL")
+
+    params = {"start": block.start, "end": block.end}
+    written: Dict[str, int] = {}
+    staged: List[Tuple[str, str]] = []
+    try:
+        db.commit()
+        db.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"))
+        for model in PARTITIONED_MODELS:
+            table = model.__tablename__
+            name = partition_name(table, block)
+            path = os.path.join(output_dir, table, f"{name}.parquet")
+            staged.append((path + '.tmp', path))
+            written[table] = _write_parquet(db, model.__table__, f"SELECT * FROM {name}", {}, path + '.tmp')
+
+        for model, key in ((ColumbiaSpecFile, 'spec_id'), (ColumbiaSpecification, 'id')):
+            table = model.__tablename__
+            path = os.path.join(output_dir, table, f"{table}_{block.suffix}.parquet")
+            staged.append((path + '.tmp', path))
+            written[table] = _write_parquet(
+                db, model.__table__,
+                f"SELECT * FROM {table} WHERE {key} >= :start AND {key} < :end",
+                params, path + '.tmp'
+            )
+        db.commit()
+
+        # Fail fast rather than queue behind long readers, which would block
+        # every later query on the parent tables until the lock is granted
+        db.execute(text(f"SET LOCAL lock_timeout = '{ARCHIVE_LOCK_TIMEOUT}'"))
+        for model in PARTITIONED_MODELS:
+            table = model.__tablename__
+            name = partition_name(table, block)
+            db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            _check_count(db, table, f"SELECT COUNT(*) FROM {name}", {}, written[table])
+            db.execute(text(f"DROP TABLE {name}"))
+
+        _check_count(
+            db, ColumbiaSpecFile.__tablename__,
+            f"SELECT COUNT(*) FROM {ColumbiaSpecFile.__tablename__} WHERE spec_id >= :start AND spec_id < :end",
+            params, written[ColumbiaSpecFile.__tablename__]
+        )
+        # Child partitions are already gone, so this cascade has nothing to scan
+        deleted = db.execute(text(
+            "DELETE FROM columbia_specifications WHERE id >= :start AND id < :end"
+        ), params).rowcount
+        if deleted != written[ColumbiaSpecification.__tablename__]:
+            raise RuntimeError(
+                f"columbia_specifications changed while archiving specs {block.start}-{block.end - 1}"
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        for tmp_path, _ in staged:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+
+    for tmp_path, path in staged:
+        os.replace(tmp_path, path)
+    _known_blocks.discard(block.start)
+    return written
+
+
+def _check_count(db: Session, table: str, query: str, params: dict, expected: int):
+    """Raise if ``query`` no longer counts the rows written to the archive"""
+    actual = db.execute(text(query), params).scalar()
+    if actual != expected:
+        raise RuntimeError(
+            f"{table} changed while archiving ({expected} rows written, {actual} now present)"
+        )
+
+
+def _write_parquet(db: Session, table, query: str, params: dict, path: str) -> int:
+    """Stream a query result into a Parquet file with a schema taken from ``table``"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([pa.field(c.name, _arrow_type(c.type)) for c in table.columns])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    count = 0
+    result = db.execute(text(query), params, execution_options={"stream_results": True}).mappings()
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        while True:
+            rows = result.fetchmany(ARCHIVE_BATCH_SIZE)
+            if not rows:
+                break
+            columns = {name: [row.get(name) for row in rows] for name in schema.names}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            count += len(rows)
+    return count
+
+
+def _arrow_type(sa_type):
+    import pyarrow as pa
+    from decimal import Decimal
+
+    python_type = sa_type.python_type
+    if python_type is bool:
+        return pa.bool_()
+    if python_type is int:
+        return pa.int64()
+    if python_type is Decimal:
+        return pa.decimal128(sa_type.precision or 38, sa_type.scale or 0)
+    if python_type is datetime:
+        return pa.timestamp('us')
+    return pa.string()
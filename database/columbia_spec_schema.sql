@@ -1,5 +1,11 @@
 -- Columbia Sportswear Specification Database Schema
 -- PostgreSQL schema for storing parsed specification data
+--
+-- The per-specification child tables (trims, suppliers, color BOM,
+-- measurements, parsing logs) are range-partitioned by spec_id in blocks of
+-- SPEC_PARTITION_SIZE (default 1000) specifications. The backend creates
+-- partitions as specifications are added; old blocks are archived to Parquet
+-- and dropped with `python -m scripts.spec_partitions archive`.
 
 -- ============================================
 -- 1. SPECIFICATIONS TABLE (Parent)
@@ -11,7 +17,7 @@ CREATE TABLE IF NOT EXISTS columbia_specifications (
     original_filename VARCHAR(255) NOT NULL,
     file_type VARCHAR(50),  -- "txt", "pdf", etc.
     file_size INTEGER,  -- Size in bytes
-    upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    upload_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,  -- Keyset pagination key
     parsed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     status VARCHAR(50) DEFAULT 'parsed',  -- 'parsed', 'error', 'processing'
     error_message TEXT,
@@ -23,7 +29,8 @@ CREATE TABLE IF NOT EXISTS columbia_specifications (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_spec_upload_date ON columbia_specifications(upload_date);
+-- (upload_date, id) backs keyset pagination of the specification list
+CREATE INDEX idx_spec_upload_date ON columbia_specifications(upload_date, id);
 CREATE INDEX idx_spec_status ON columbia_specifications(status);
 CREATE INDEX idx_spec_filename ON columbia_specifications(filename);
 
@@ -32,7 +39,7 @@ CREATE INDEX idx_spec_filename ON columbia_specifications(filename);
 -- ============================================
 -- Main table for all trim components
 CREATE TABLE IF NOT EXISTS columbia_spec_trims (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     spec_id INTEGER NOT NULL,
     number VARCHAR(50) NOT NULL,
     description TEXT NOT NULL,
@@ -46,11 +53,12 @@ CREATE TABLE IF NOT EXISTS columbia_spec_trims (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
+    PRIMARY KEY (id, spec_id),
     CONSTRAINT fk_spec FOREIGN KEY (spec_id) REFERENCES columbia_specifications(id) ON DELETE CASCADE
-);
+) PARTITION BY RANGE (spec_id);
 
 CREATE INDEX idx_trim_number ON columbia_spec_trims(number);
-CREATE INDEX idx_trim_spec ON columbia_spec_trims(spec_id);
+CREATE INDEX idx_trim_spec ON columbia_spec_trims(spec_id, id);
 CREATE INDEX idx_trim_created ON columbia_spec_trims(created_at);
 
 -- ============================================
@@ -58,7 +66,8 @@ CREATE INDEX idx_trim_created ON columbia_spec_trims(created_at);
 -- ============================================
 -- Stores all supplier information for each trim
 CREATE TABLE IF NOT EXISTS columbia_spec_suppliers (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
+    spec_id INTEGER NOT NULL,  -- Denormalized from the trim for partitioning
     trim_id INTEGER NOT NULL,
     name VARCHAR(255) NOT NULL,
     art_no VARCHAR(100),
@@ -70,10 +79,12 @@ CREATE TABLE IF NOT EXISTS columbia_spec_suppliers (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
-    CONSTRAINT fk_trim FOREIGN KEY (trim_id) REFERENCES columbia_spec_trims(id) ON DELETE CASCADE
-);
+    PRIMARY KEY (id, spec_id),
+    CONSTRAINT fk_trim FOREIGN KEY (spec_id, trim_id) REFERENCES columbia_spec_trims(spec_id, id) ON DELETE CASCADE
+) PARTITION BY RANGE (spec_id);
 
-CREATE INDEX idx_supplier_trim ON columbia_spec_suppliers(trim_id);
+CREATE INDEX idx_supplier_spec ON columbia_spec_suppliers(spec_id, id);
+CREATE INDEX idx_supplier_trim ON columbia_spec_suppliers(trim_id, id);
 CREATE INDEX idx_supplier_name ON columbia_spec_suppliers(name);
 CREATE INDEX idx_supplier_country ON columbia_spec_suppliers(country);
 
@@ -82,7 +93,7 @@ CREATE INDEX idx_supplier_country ON columbia_spec_suppliers(country);
 -- ============================================
 -- Color Bill of Materials - component assignments per color
 CREATE TABLE IF NOT EXISTS columbia_spec_color_bom (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     spec_id INTEGER NOT NULL,
     color_name VARCHAR(255) NOT NULL,  -- e.g., "Columbia Blue", "Black"
     component_name VARCHAR(255) NOT NULL,  -- Component reference
@@ -92,10 +103,11 @@ CREATE TABLE IF NOT EXISTS columbia_spec_color_bom (
     placement VARCHAR(255),  -- Placement information
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
+    PRIMARY KEY (id, spec_id),
     CONSTRAINT fk_spec_bom FOREIGN KEY (spec_id) REFERENCES columbia_specifications(id) ON DELETE CASCADE
-);
+) PARTITION BY RANGE (spec_id);
 
-CREATE INDEX idx_bom_spec ON columbia_spec_color_bom(spec_id);
+CREATE INDEX idx_bom_spec ON columbia_spec_color_bom(spec_id, id);
 CREATE INDEX idx_bom_color ON columbia_spec_color_bom(color_name);
 
 -- ============================================
@@ -103,7 +115,7 @@ CREATE INDEX idx_bom_color ON columbia_spec_color_bom(color_name);
 -- ============================================
 -- Stores measurement data from specification
 CREATE TABLE IF NOT EXISTS columbia_spec_measurements (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     spec_id INTEGER NOT NULL,
     measurement_key VARCHAR(255) NOT NULL,  -- e.g., "Chest Width", "Sleeve Length"
     measurement_value VARCHAR(255),  -- e.g., "52cm", "65cm"
@@ -111,8 +123,9 @@ CREATE TABLE IF NOT EXISTS columbia_spec_measurements (
     size_variant VARCHAR(50),  -- e.g., "S", "M", "L", "XL"
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
+    PRIMARY KEY (id, spec_id),
     CONSTRAINT fk_spec_measurements FOREIGN KEY (spec_id) REFERENCES columbia_specifications(id) ON DELETE CASCADE
-);
+) PARTITION BY RANGE (spec_id);
 
 CREATE INDEX idx_measurements_spec ON columbia_spec_measurements(spec_id);
 CREATE INDEX idx_measurements_key ON columbia_spec_measurements(measurement_key);
@@ -120,13 +133,17 @@ CREATE INDEX idx_measurements_key ON columbia_spec_measurements(measurement_key)
 -- ============================================
 -- 6. SPECIFICATION FILES TABLE
 -- ============================================
--- Stores the actual file content or file path
+-- Reference to the original upload in the content-addressed blob store
 CREATE TABLE IF NOT EXISTS columbia_spec_files (
     id SERIAL PRIMARY KEY,
     spec_id INTEGER NOT NULL,
-    file_path TEXT,  -- Path to stored file (or S3 URL)
-    file_content BYTEA,  -- Binary file content (optional if storing in DB)
-    storage_type VARCHAR(50) DEFAULT 'filesystem',  -- 'filesystem', 's3', 'database'
+    file_path TEXT,  -- Blob store key, e.g. "ab/cd/<sha256>.zst"
+    content_hash VARCHAR(64),  -- SHA-256 of the original bytes
+    content_type VARCHAR(100),
+    content_size INTEGER,  -- Original size in bytes
+    stored_size INTEGER,  -- Compressed size in bytes
+    compression VARCHAR(20),  -- 'zstd', 'gzip'
+    storage_type VARCHAR(50) DEFAULT 'filesystem',  -- 'filesystem', 's3'
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
     CONSTRAINT fk_spec_file FOREIGN KEY (spec_id) REFERENCES columbia_specifications(id) ON DELETE CASCADE,
@@ -134,6 +151,7 @@ CREATE TABLE IF NOT EXISTS columbia_spec_files (
 );
 
 CREATE INDEX idx_spec_file_spec ON columbia_spec_files(spec_id);
+CREATE INDEX idx_spec_file_path ON columbia_spec_files(file_path);
 
 -- ============================================
 -- 7. EXPORT HISTORY TABLE
@@ -146,14 +164,14 @@ CREATE TABLE IF NOT EXISTS columbia_spec_exports (
     export_format VARCHAR(50),  -- 'xlsx', 'csv'
     filename VARCHAR(255),
     file_path TEXT,
-    exported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    exported_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,  -- Keyset pagination key
     exported_by INTEGER,  -- User ID
     record_count INTEGER,  -- Number of records exported
     
     CONSTRAINT fk_spec_export FOREIGN KEY (spec_id) REFERENCES columbia_specifications(id) ON DELETE SET NULL
 );
 
-CREATE INDEX idx_export_spec ON columbia_spec_exports(spec_id);
+CREATE INDEX idx_export_spec ON columbia_spec_exports(spec_id, exported_at, id);
 CREATE INDEX idx_export_date ON columbia_spec_exports(exported_at);
 
 -- ============================================
@@ -161,16 +179,17 @@ CREATE INDEX idx_export_date ON columbia_spec_exports(exported_at);
 -- ============================================
 -- Log parsing errors for debugging
 CREATE TABLE IF NOT EXISTS columbia_spec_parsing_logs (
-    id SERIAL PRIMARY KEY,
-    spec_id INTEGER,
+    id SERIAL,
+    spec_id INTEGER NOT NULL,
     log_level VARCHAR(20),  -- 'info', 'warning', 'error'
     message TEXT,
     line_number INTEGER,  -- Line number in file
     context TEXT,  -- Additional context
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
+    PRIMARY KEY (id, spec_id),
     CONSTRAINT fk_spec_log FOREIGN KEY (spec_id) REFERENCES columbia_specifications(id) ON DELETE CASCADE
-);
+) PARTITION BY RANGE (spec_id);
 
 CREATE INDEX idx_log_spec ON columbia_spec_parsing_logs(spec_id);
 CREATE INDEX idx_log_level ON columbia_spec_parsing_logs(log_level);
@@ -193,8 +212,8 @@ SELECT
     s.name as suppliers,
     t.created_at
 FROM columbia_spec_trims t
-LEFT JOIN columbia_spec_suppliers s ON t.id = s.trim_id
-GROUP BY t.id, s.name;
+LEFT JOIN columbia_spec_suppliers s ON t.spec_id = s.spec_id AND t.id = s.trim_id
+GROUP BY t.id, t.spec_id, s.name;
 
 -- View: Specification summary
 CREATE OR REPLACE VIEW v_spec_summary AS
@@ -213,7 +232,7 @@ SELECT
     COUNT(DISTINCT m.id) as actual_measurement_count
 FROM columbia_specifications s
 LEFT JOIN columbia_spec_trims t ON s.id = t.spec_id
-LEFT JOIN columbia_spec_suppliers sup ON t.id = sup.trim_id
+LEFT JOIN columbia_spec_suppliers sup ON t.spec_id = sup.spec_id AND t.id = sup.trim_id
 LEFT JOIN columbia_spec_color_bom bom ON s.id = bom.spec_id
 LEFT JOIN columbia_spec_measurements m ON s.id = m.spec_id
 GROUP BY s.id;
@@ -228,7 +247,7 @@ SELECT
     AVG(sup.standard_cost_fob) as avg_fob_cost,
     AVG(sup.purchase_cost_cif) as avg_cif_cost
 FROM columbia_spec_suppliers sup
-JOIN columbia_spec_trims t ON sup.trim_id = t.id
+JOIN columbia_spec_trims t ON sup.spec_id = t.spec_id AND sup.trim_id = t.id
 GROUP BY sup.name, sup.country;
 
 -- ============================================
@@ -264,8 +283,7 @@ BEGIN
     UPDATE columbia_specifications 
     SET 
         total_trims = (SELECT COUNT(*) FROM columbia_spec_trims WHERE spec_id = NEW.spec_id),
-        total_suppliers = (SELECT COUNT(*) FROM columbia_spec_suppliers WHERE trim_id IN 
-                          (SELECT id FROM columbia_spec_trims WHERE spec_id = NEW.spec_id)),
+        total_suppliers = (SELECT COUNT(*) FROM columbia_spec_suppliers WHERE spec_id = NEW.spec_id),
         total_colors = (SELECT COUNT(DISTINCT color_name) FROM columbia_spec_color_bom WHERE spec_id = NEW.spec_id),
         total_measurements = (SELECT COUNT(*) FROM columbia_spec_measurements WHERE spec_id = NEW.spec_id)
     WHERE id = NEW.spec_id;
@@ -273,6 +291,15 @@ BEGIN
 END;
 $$ language 'plpgsql';
 
+-- Partitions are created by the backend as specifications are added
+-- (backend/services/partitioning.py). On a fresh database, run
+--   python -m scripts.spec_partitions ensure
+-- from the backend directory before loading data. Databases created from an
+-- earlier, unpartitioned version of this file are converted with
+--   python -m scripts.spec_partitions migrate
+-- after which the views above should be reapplied. SPEC_PARTITION_SIZE must
+-- not change once partitions exist.
+
 -- ============================================
 -- 11. SAMPLE QUERIES
 -- ============================================